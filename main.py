@@ -2,12 +2,14 @@
 
 import pygame
 import numpy as np
+import asyncio
 import time
 import json
 import math
 from collections import deque
 from datetime import datetime
 import threading
+import traceback
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
@@ -18,17 +20,103 @@ except ImportError:
     OVR_AVAILABLE = False
     print("Warning: OVR SDK not found. Using simulation mode.")
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _position_stats_numpy(positions):
+    mean = positions.mean(axis=0)
+    var = np.square(positions - mean).mean(axis=0)
+    value_range = positions.max(axis=0) - positions.min(axis=0)
+    return mean, np.sqrt(var), value_range, np.sqrt(var.sum())
+
+def _position_stats_loop(positions):
+    # Single pass over the samples; values are shifted by the first sample
+    # so the sum-of-squares variance stays numerically stable
+    n, dims = positions.shape
+    shift = positions[0].astype(np.float64)
+    sums = np.zeros(dims)
+    sq_sums = np.zeros(dims)
+    lo = shift.copy()
+    hi = shift.copy()
+    for i in range(n):
+        for j in range(dims):
+            v = positions[i, j]
+            x = v - shift[j]
+            sums[j] += x
+            sq_sums[j] += x * x
+            if v < lo[j]:
+                lo[j] = v
+            if v > hi[j]:
+                hi[j] = v
+    
+    mean = np.empty(dims)
+    std = np.empty(dims)
+    total_var = 0.0
+    for j in range(dims):
+        m = sums[j] / n
+        var = max(sq_sums[j] / n - m * m, 0.0)
+        mean[j] = shift[j] + m
+        std[j] = math.sqrt(var)
+        total_var += var
+    return mean, std, hi - lo, math.sqrt(total_var)
+
+if NUMBA_AVAILABLE:
+    position_stats = njit(cache=True, fastmath=True)(_position_stats_loop)
+else:
+    position_stats = _position_stats_numpy
+
+def warm_position_stats():
+    # Trigger numba compilation off the Tk thread so the first
+    # "Calculate Metrics" click does not stall the GUI
+    if NUMBA_AVAILABLE:
+        threading.Thread(target=position_stats,
+                         args=(np.zeros((2, 3), dtype=np.float32),),
+                         daemon=True).start()
+
 class DK2TrackingCalibrator:
+    # Tracking samples are kept as parallel ring buffers (one array per field)
+    RING_SIZE = 1000
+    
+    VIZ_CENTER = (400, 300)
+    VIZ_SCALE = 100
+    TRAIL_LENGTH = 50
+    
     def __init__(self):
+        warm_position_stats()
         self.running = False
+        self._loop = None
+        self._tracking_future = None
+        self._tracking_error = None
         self.ovr_session = None
-        self.tracking_data = deque(maxlen=1000)
+        self._ts = np.zeros(self.RING_SIZE, dtype=np.float64)
+        self._pos = np.zeros((self.RING_SIZE, 3), dtype=np.float32)
+        self._rot = np.zeros((self.RING_SIZE, 4), dtype=np.float32)
+        self._valid = np.zeros(self.RING_SIZE, dtype=bool)
+        self._ring_idx = 0
+        self._ring_count = 0
+        self._ring_lock = threading.Lock()
         self.calibration_points = []
         self.reference_points = []
-        self.position_history = deque(maxlen=100)
-        self.rotation_history = deque(maxlen=100)
         self.frame_times = deque(maxlen=60)
         
+        self._trail = np.zeros((self.TRAIL_LENGTH, 2), dtype=np.int32)
+        self._trail_len = 0
+        self._trail_points = []
+        self._trail_dirty = False
+        self._viz_dirty = True
+        self._trail_lock = threading.Lock()
+        self._latest_state = None
+        self._label_cache = {}
+        
         self.tracking_bounds = {
             'x_min': -2.0, 'x_max': 2.0,
             'y_min': -1.5, 'y_max': 1.5,
@@ -74,6 +162,8 @@ class DK2TrackingCalibrator:
         notebook.add(self.settings_frame, text="Settings")
         self.create_settings_tab()
         
+        self.root.after(50, self._gui_refresh)
+        
     def create_monitor_tab(self):
         status_frame = ttk.LabelFrame(self.monitor_frame, text="Tracking Status")
         status_frame.pack(fill='x', padx=5, pady=5)
@@ -183,7 +273,11 @@ class DK2TrackingCalibrator:
         self.viz_screen = pygame.display.set_mode((800, 600))
         pygame.display.set_caption("DK2 Tracking Visualization")
         self.viz_font = pygame.font.Font(None, 24)
+        self.viz_instr_font = pygame.font.Font(None, 18)
         self.viz_running = False
+        self._update_viz_geometry()
+        self._build_viz_background()
+        self._bg_dirty = False
         
     def start_tracking(self):
         if self.running:
@@ -193,9 +287,13 @@ class DK2TrackingCalibrator:
         self.start_btn.config(state='disabled')
         self.stop_btn.config(state='normal')
         
-        self.tracking_thread = threading.Thread(target=self.tracking_loop)
-        self.tracking_thread.daemon = True
-        self.tracking_thread.start()
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self.tracking_thread = threading.Thread(target=self._loop.run_forever)
+            self.tracking_thread.daemon = True
+            self.tracking_thread.start()
+        self._tracking_future = asyncio.run_coroutine_threadsafe(self.tracking_loop(), self._loop)
+        self._tracking_future.add_done_callback(self._on_tracking_done)
         
         self.viz_thread = threading.Thread(target=self.visualization_loop)
         self.viz_thread.daemon = True
@@ -203,38 +301,74 @@ class DK2TrackingCalibrator:
         
     def stop_tracking(self):
         self.running = False
+        if self._tracking_future:
+            self._tracking_future.cancel()
         self.viz_running = False
         self.start_btn.config(state='normal')
         self.stop_btn.config(state='disabled')
         
-    def tracking_loop(self):
-        last_time = time.time()
+    def _on_tracking_done(self, future):
+        # Runs on the asyncio thread; _gui_refresh reports it on the Tk thread
+        if future.cancelled() or future.exception() is None:
+            return
+        self._tracking_error = (future, future.exception())
+    
+    async def tracking_loop(self):
+        loop = asyncio.get_running_loop()
+        frame_interval = 1.0 / 60.0
+        last_time = loop.time()
+        next_deadline = last_time
         
         while self.running:
-            current_time = time.time()
-            dt = current_time - last_time
+            now = loop.time()
+            dt = now - last_time
             self.frame_times.append(dt)
-            last_time = current_time
+            last_time = now
+            current_time = time.time()
             
             if self.ovr_session:
                 tracking_state = self.get_ovr_tracking_state()
             else:
                 tracking_state = self.get_simulated_tracking_state()
             
-            self.tracking_data.append({
-                'timestamp': current_time,
-                'position': tracking_state['position'],
-                'rotation': tracking_state['rotation'],
-                'tracking_valid': tracking_state['valid']
-            })
+            with self._ring_lock:
+                i = self._ring_idx % self.RING_SIZE
+                self._ts[i] = current_time
+                self._pos[i] = tracking_state['position']
+                self._rot[i] = tracking_state['rotation']
+                self._valid[i] = bool(tracking_state['valid'])
+                self._ring_idx += 1
+                self._ring_count = min(self._ring_count + 1, self.RING_SIZE)
             
-            self.position_history.append(tracking_state['position'])
-            self.rotation_history.append(tracking_state['rotation'])
+            self._push_trail_point(tracking_state['position'])
             
-            self.update_gui(tracking_state)
+            self._latest_state = tracking_state
             
-            time.sleep(0.016)
+            next_deadline += frame_interval
+            if now > next_deadline + 0.1:
+                # Recover from long stalls instead of bursting to catch up
+                next_deadline = now
+            await asyncio.sleep(max(0.0, next_deadline - loop.time()))
             
+    def _push_trail_point(self, pos):
+        center_x, center_y = self.VIZ_CENTER
+        point = (int(center_x + pos[0] * self.VIZ_SCALE), int(center_y - pos[1] * self.VIZ_SCALE))
+        with self._trail_lock:
+            n = self._trail_len
+            # Repeated pixels add no visible segment, so the drawn trail only
+            # changes if the new point moved or the dropped point was distinct
+            changed = n == 0 or (self._trail[n - 1] != point).any()
+            if n < self.TRAIL_LENGTH:
+                self._trail[n] = point
+                self._trail_len += 1
+            else:
+                changed = changed or (self._trail[0] != self._trail[1]).any()
+                self._trail[:-1] = self._trail[1:]
+                self._trail[-1] = point
+            if changed:
+                self._trail_dirty = True
+                self._viz_dirty = True
+    
     def get_ovr_tracking_state(self):
         try:
             tracking_state = ovr.getTrackingState(self.ovr_session, 0.0, True)
@@ -251,7 +385,7 @@ class DK2TrackingCalibrator:
             return self.get_simulated_tracking_state()
     
     def get_simulated_tracking_state(self):
-        t = time.time()
+        t = time.monotonic()
         return {
             'position': [
                 0.5 * math.sin(t * 0.5),
@@ -262,88 +396,131 @@ class DK2TrackingCalibrator:
             'valid': True
         }
     
+    def _gui_refresh(self):
+        if self._tracking_error is not None:
+            future, exc = self._tracking_error
+            self._tracking_error = None
+            print("Tracking loop failed:")
+            traceback.print_exception(type(exc), exc, exc.__traceback__)
+            if future is self._tracking_future:
+                self.stop_tracking()
+        
+        tracking_state = self._latest_state
+        if tracking_state is not None:
+            self.update_gui(tracking_state)
+        self.root.after(50, self._gui_refresh)
+    
+    def _set_label(self, label, text, **options):
+        # Skip the Tcl round-trip when nothing changed since the last refresh
+        key = (text, tuple(options.items()))
+        if self._label_cache.get(label) != key:
+            self._label_cache[label] = key
+            label.config(text=text, **options)
+    
     def update_gui(self, tracking_state):
-        def update():
-            if tracking_state['valid']:
-                self.status_labels['Connection'].config(text="Connected", foreground="green")
-                self.status_labels['Position Tracking'].config(text="Active", foreground="green")
-                self.status_labels['Orientation Tracking'].config(text="Active", foreground="green")
-            else:
-                self.status_labels['Connection'].config(text="Disconnected", foreground="red")
-                self.status_labels['Position Tracking'].config(text="Lost", foreground="red")
-                self.status_labels['Orientation Tracking'].config(text="Lost", foreground="red")
-            
-            if len(self.frame_times) > 0:
-                avg_frame_time = sum(self.frame_times) / len(self.frame_times)
-                fps = 1.0 / avg_frame_time if avg_frame_time > 0 else 0
-                self.status_labels['Frame Rate'].config(text=f"{fps:.1f} FPS")
-            
-            pos = tracking_state['position']
-            rot = tracking_state['rotation']
-            
-            self.data_labels['Position X'].config(text=f"{pos[0]:.3f}")
-            self.data_labels['Position Y'].config(text=f"{pos[1]:.3f}")
-            self.data_labels['Position Z'].config(text=f"{pos[2]:.3f}")
-            self.data_labels['Rotation X'].config(text=f"{rot[0]:.3f}")
-            self.data_labels['Rotation Y'].config(text=f"{rot[1]:.3f}")
-            self.data_labels['Rotation Z'].config(text=f"{rot[2]:.3f}")
-        
-        self.root.after(0, update)
+        if tracking_state['valid']:
+            self._set_label(self.status_labels['Connection'], "Connected", foreground="green")
+            self._set_label(self.status_labels['Position Tracking'], "Active", foreground="green")
+            self._set_label(self.status_labels['Orientation Tracking'], "Active", foreground="green")
+        else:
+            self._set_label(self.status_labels['Connection'], "Disconnected", foreground="red")
+            self._set_label(self.status_labels['Position Tracking'], "Lost", foreground="red")
+            self._set_label(self.status_labels['Orientation Tracking'], "Lost", foreground="red")
+        
+        if len(self.frame_times) > 0:
+            avg_frame_time = sum(self.frame_times) / len(self.frame_times)
+            fps = 1.0 / avg_frame_time if avg_frame_time > 0 else 0
+            self._set_label(self.status_labels['Frame Rate'], f"{fps:.1f} FPS")
+        
+        pos = tracking_state['position']
+        rot = tracking_state['rotation']
+        
+        self._set_label(self.data_labels['Position X'], f"{pos[0]:.3f}")
+        self._set_label(self.data_labels['Position Y'], f"{pos[1]:.3f}")
+        self._set_label(self.data_labels['Position Z'], f"{pos[2]:.3f}")
+        self._set_label(self.data_labels['Rotation X'], f"{rot[0]:.3f}")
+        self._set_label(self.data_labels['Rotation Y'], f"{rot[1]:.3f}")
+        self._set_label(self.data_labels['Rotation Z'], f"{rot[2]:.3f}")
     
     def visualization_loop(self):
         self.viz_running = True
+        self._viz_dirty = True
         clock = pygame.time.Clock()
         
         while self.viz_running:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.viz_running = False
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self._viz_dirty = True
             
-            self.viz_screen.fill((20, 20, 40))
+            if self._bg_dirty:
+                self._bg_dirty = False
+                self._build_viz_background()
+                self._viz_dirty = True
             
-            if len(self.position_history) > 0:
-                self.draw_tracking_visualization()
+            if not self._viz_dirty:
+                clock.tick(60)
+                continue
+            self._viz_dirty = False
             
-            self.draw_visualization_ui()
+            self.viz_screen.blit(self._bg, (0, 0))
+            self.viz_screen.lock()
+            try:
+                self.draw_tracking_visualization()
+            finally:
+                self.viz_screen.unlock()
             
             pygame.display.flip()
             clock.tick(60)
     
-    def draw_tracking_visualization(self):
-        center_x, center_y = 400, 300
-        scale = 100
-        
-        pygame.draw.line(self.viz_screen, (255, 0, 0), 
-                        (center_x, center_y), (center_x + 100, center_y), 2)
-        pygame.draw.line(self.viz_screen, (0, 255, 0), 
-                        (center_x, center_y), (center_x, center_y - 100), 2)  
-        
-        if len(self.position_history) > 1:
-            points = []
-            for pos in list(self.position_history)[-50:]:  
-                x = center_x + pos[0] * scale
-                y = center_y - pos[1] * scale  
-                points.append((x, y))
-            
-            if len(points) > 1:
-                pygame.draw.lines(self.viz_screen, (100, 100, 255), False, points, 2)
+    def _build_viz_background(self):
+        # Everything that only changes with the tracking bounds is drawn once here
+        bg = self.viz_screen.copy()
+        bg.fill((20, 20, 40))
+        bg.lock()
+        try:
+            self.draw_tracking_bounds(bg)
+        finally:
+            bg.unlock()
+        self.draw_visualization_ui(bg)
+        self._bg = bg
+    
+    def _update_viz_geometry(self):
+        center_x, center_y = self.VIZ_CENTER
+        scale = self.VIZ_SCALE
         
-        if len(self.position_history) > 0:
-            pos = self.position_history[-1]
-            x = center_x + pos[0] * scale
-            y = center_y - pos[1] * scale
-            pygame.draw.circle(self.viz_screen, (255, 255, 0), (int(x), int(y)), 8)
+        self._x_axis = ((center_x, center_y), (center_x + 100, center_y))
+        self._y_axis = ((center_x, center_y), (center_x, center_y - 100))
         
         bounds = self.tracking_bounds
-        rect_x = center_x + bounds['x_min'] * scale
-        rect_y = center_y - bounds['y_max'] * scale
-        rect_w = (bounds['x_max'] - bounds['x_min']) * scale
-        rect_h = (bounds['y_max'] - bounds['y_min']) * scale
-        pygame.draw.rect(self.viz_screen, (0, 255, 0), (rect_x, rect_y, rect_w, rect_h), 2)
+        self._bounds_rect = pygame.Rect(
+            center_x + bounds['x_min'] * scale,
+            center_y - bounds['y_max'] * scale,
+            (bounds['x_max'] - bounds['x_min']) * scale,
+            (bounds['y_max'] - bounds['y_min']) * scale)
+    
+    def draw_tracking_bounds(self, surface):
+        pygame.draw.line(surface, (255, 0, 0), *self._x_axis, 2)
+        pygame.draw.line(surface, (0, 255, 0), *self._y_axis, 2)
+        pygame.draw.rect(surface, (0, 255, 0), self._bounds_rect, 2)
     
-    def draw_visualization_ui(self):
+    def draw_tracking_visualization(self):
+        if self._trail_dirty:
+            with self._trail_lock:
+                self._trail_points = self._trail[:self._trail_len].tolist()
+                self._trail_dirty = False
+        
+        points = self._trail_points
+        if len(points) > 1:
+            pygame.draw.lines(self.viz_screen, (100, 100, 255), False, points, 2)
+        
+        if points:
+            pygame.draw.circle(self.viz_screen, (255, 255, 0), points[-1], 8)
+    
+    def draw_visualization_ui(self, surface):
         title = self.viz_font.render("DK2 Tracking Visualization", True, (255, 255, 255))
-        self.viz_screen.blit(title, (10, 10))
+        surface.blit(title, (10, 10))
         
         instructions = [
             "Yellow dot: Current position",
@@ -353,8 +530,8 @@ class DK2TrackingCalibrator:
         ]
         
         for i, instr in enumerate(instructions):
-            text = pygame.font.Font(None, 18).render(instr, True, (200, 200, 200))
-            self.viz_screen.blit(text, (10, 550 - i * 20))
+            text = self.viz_instr_font.render(instr, True, (200, 200, 200))
+            surface.blit(text, (10, 550 - i * 20))
     
     def start_calibration(self):
         self.calibration_points = []
@@ -374,27 +551,51 @@ class DK2TrackingCalibrator:
         messagebox.showinfo("Calibration", "Calibration process started!\n"
                           "Follow the on-screen prompts in the visualization window.")
     
+    def _ring_snapshot(self, count=None):
+        # Hold the ring lock so all four arrays come from the same set of samples
+        with self._ring_lock:
+            n = self._ring_count if count is None else min(count, self._ring_count)
+            end = self._ring_idx % self.RING_SIZE
+            start = end - n
+            
+            def ordered(arr):
+                if start >= 0:
+                    return arr[start:end].copy()
+                return np.concatenate((arr[start:], arr[:end]))
+            
+            return ordered(self._ts), ordered(self._pos), ordered(self._rot), ordered(self._valid)
+    
     def calculate_metrics(self):
-        if len(self.tracking_data) < 100:
+        if self._ring_count < 100:
             messagebox.showwarning("Warning", "Not enough tracking data for analysis.")
             return
         
-        positions = np.array([data['position'] for data in list(self.tracking_data)[-100:]])
-        mean_pos = np.mean(positions, axis=0)
-        jitter = np.sqrt(np.mean(np.sum((positions - mean_pos) ** 2, axis=1)))
+        ts, positions, rotations, _ = self._ring_snapshot()
+        jitter = position_stats(positions[-100:])[3]
+        rotation_jitter = self._rotation_jitter(rotations[-100:])
         
-        if len(self.tracking_data) > 1:
-            start_pos = np.array(self.tracking_data[0]['position'])
-            end_pos = np.array(list(self.tracking_data)[-1]['position'])
-            time_diff = list(self.tracking_data)[-1]['timestamp'] - self.tracking_data[0]['timestamp']
-            drift_rate = np.linalg.norm(end_pos - start_pos) / time_diff if time_diff > 0 else 0
-        else:
-            drift_rate = 0
+        time_diff = ts[-1] - ts[0]
+        drift_rate = np.linalg.norm(positions[-1] - positions[0]) / time_diff if time_diff > 0 else 0
         
         self.metric_labels['Jitter (RMS)'].config(text=f"{jitter:.4f} m")
         self.metric_labels['Drift Rate'].config(text=f"{drift_rate:.4f} m/s")
         self.metric_labels['Position Accuracy'].config(text="Requires calibration")
-        self.metric_labels['Rotation Accuracy'].config(text="Requires calibration")
+        self.metric_labels['Rotation Accuracy'].config(text=f"{np.degrees(rotation_jitter):.4f} deg (RMS)")
+    
+    def _rotation_jitter(self, quats):
+        # RMS angle between consecutive orientation samples, in radians
+        q = quats.astype(np.float64)
+        norms = np.linalg.norm(q, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        q /= norms
+        q0, q1 = q[:-1], q[1:]
+        # q and -q are the same rotation; compare against the nearer sign
+        q1 = q1 * np.where(np.einsum('ij,ij->i', q0, q1) < 0, -1.0, 1.0)[:, None]
+        # Equivalent to 2*arccos(|q0.q1|), but stays accurate for tiny angles:
+        # arctan2(|q1-q0|, |q1+q0|) is a quarter of the rotation angle
+        angles = 4.0 * np.arctan2(np.linalg.norm(q1 - q0, axis=1),
+                                  np.linalg.norm(q1 + q0, axis=1))
+        return np.sqrt(np.mean(angles ** 2))
     
     def reset_center(self):
         if self.ovr_session:
@@ -409,6 +610,8 @@ class DK2TrackingCalibrator:
     def apply_settings(self):
         for key, var in self.bound_vars.items():
             self.tracking_bounds[key] = var.get()
+        self._update_viz_geometry()
+        self._bg_dirty = True
         messagebox.showinfo("Success", "Settings applied successfully.")
     
     def save_calibration(self):
@@ -422,8 +625,12 @@ class DK2TrackingCalibrator:
                 'calibration_points': self.calibration_points,
                 'tracking_bounds': self.tracking_bounds
             }
-            with open(filename, 'w') as f:
-                json.dump(calib_data, f, indent=2)
+            if ORJSON_AVAILABLE:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(calib_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            else:
+                with open(filename, 'w') as f:
+                    json.dump(calib_data, f, indent=2)
             messagebox.showinfo("Success", f"Calibration saved to {filename}")
     
     def load_calibration(self):
@@ -440,13 +647,15 @@ class DK2TrackingCalibrator:
                 # Update GUI
                 for key, var in self.bound_vars.items():
                     var.set(self.tracking_bounds[key])
+                self._update_viz_geometry()
+                self._bg_dirty = True
                 
                 messagebox.showinfo("Success", f"Calibration loaded from {filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load calibration: {e}")
     
     def export_data(self):
-        if not self.tracking_data:
+        if not self._ring_count:
             messagebox.showwarning("Warning", "No tracking data to export.")
             return
         
@@ -455,18 +664,15 @@ class DK2TrackingCalibrator:
             filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
         )
         if filename:
-            with open(filename, 'w') as f:
-                f.write("timestamp,pos_x,pos_y,pos_z,rot_x,rot_y,rot_z,rot_w,valid\n")
-                for data in self.tracking_data:
-                    pos = data['position']
-                    rot = data['rotation']
-                    f.write(f"{data['timestamp']},{pos[0]},{pos[1]},{pos[2]},"
-                           f"{rot[0]},{rot[1]},{rot[2]},{rot[3] if len(rot) > 3 else 0},"
-                           f"{data['tracking_valid']}\n")
+            with open(filename, 'w', buffering=1 << 20) as f:
+                ts, positions, rotations, valid = self._ring_snapshot()
+                np.savetxt(f, np.column_stack((ts, positions, rotations, valid)), fmt=['%.6f'] * 8 + ['%d'], delimiter=',',
+                           header="timestamp,pos_x,pos_y,pos_z,rot_x,rot_y,rot_z,rot_w,valid",
+                           comments='')
             messagebox.showinfo("Success", f"Data exported to {filename}")
     
     def generate_report(self):
-        if len(self.tracking_data) < 10:
+        if self._ring_count < 10:
             messagebox.showwarning("Warning", "Not enough data to generate report.")
             return
         
@@ -479,14 +685,15 @@ class DK2TrackingCalibrator:
                 f.write("DK2 Tracking Calibration Report\n")
                 f.write("=" * 40 + "\n\n")
                 f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Total samples: {len(self.tracking_data)}\n\n")
+                f.write(f"Total samples: {self._ring_count}\n\n")
                 
-                if self.tracking_data:
-                    positions = np.array([data['position'] for data in self.tracking_data])
-                    f.write("Position Statistics:\n")
-                    f.write(f"  Mean position: {np.mean(positions, axis=0)}\n")
-                    f.write(f"  Position range: {np.ptp(positions, axis=0)}\n")
-                    f.write(f"  Position std: {np.std(positions, axis=0)}\n\n")
+                if self._ring_count:
+                    _, positions, _, _ = self._ring_snapshot()
+                    mean_pos, std_pos, range_pos, _ = position_stats(positions)
+                    f.write("Position Statistics:\n"
+                            f"  Mean position: {mean_pos}\n"
+                            f"  Position range: {range_pos}\n"
+                            f"  Position std: {std_pos}\n\n")
                 
                 f.write("Tracking bounds:\n")
                 for key, value in self.tracking_bounds.items():
@@ -504,6 +711,11 @@ class DK2TrackingCalibrator:
         self.running = False
         self.viz_running = False
         
+        if self._loop:
+            if self._tracking_future:
+                self._tracking_future.cancel()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        
         if self.ovr_session and OVR_AVAILABLE:
             try:
                 ovr.destroy(self.ovr_session)